@@ -1,95 +1,174 @@
 """AI analyzer using LLM via OpenRouter to generate institutional-grade analysis."""
 
+import io
+import json
 import os
 import re
-from datetime import datetime
-from typing import List, Dict
+import asyncio
+import functools
+from datetime import date
+from typing import List, Dict, Optional
 import logging
+import grapheme
 import httpx
-from openai import OpenAI
+import openai
+from openai import OpenAI, AsyncOpenAI
+from tenacity import retry, retry_if_exception, wait_exponential, stop_after_attempt, before_sleep_log
 
-from config import MAX_TWEET_LENGTH, LLM_MODEL
+from config import (
+    MAX_TWEET_LENGTH, LLM_MODEL, LLM_MAX_CONCURRENCY, LLM_REQUEST_TIMEOUT, LLM_REASONING_MAX_TOKENS,
+    BATCH_API_BASE_URL, BATCH_LLM_MODEL, EMBEDDING_MODEL
+)
 
 # System prompt for Trader's Desk persona - CLEAN THREAD FORMAT
-SYSTEM_PROMPT = """You are a SENIOR CRYPTO PROPRIETARY TRADER writing a research note for X/Twitter.
+SYSTEM_PROMPT = """You are a senior crypto proprietary trader writing a research note for X/Twitter, for sophisticated traders. Write as "We" / "Our desk": opinionated but professional, like a morning desk note. This is a trader's analysis of WHY the story matters and WHAT it implies for markets, not a news summary.
 
-=== YOUR MISSION ===
+ACCURACY RULES (NON-NEGOTIABLE):
+- Single subject: analyze ONLY the news item provided and go deep on it.
+- Only cite facts from the news; never invent numbers or events. Factual context is allowed.
+- No trading instructions ("Buy", "Sell", "Long", "Short"). Allowed: "Bullish for...", "We see risk/reward skewed to...".
 
-Write a SINGLE-SUBJECT analysis on the provided news story. You are explaining this to sophisticated traders. Use "We" and "Our Desk" language.
+LOGICAL SANITY RULES:
+- No forced causality: do not link niche geopolitical events (small-nation trade disputes, obscure regional conflicts) to crypto price action without a direct, proven correlation. "Greenland tariffs caused BTC to drop" is fake and forced.
+- For purely macro/TradFi news, analyze the macro impact first (inflation, DXY, bond yields, risk appetite). A crypto stance is optional; if the link is weak, explain the event's significance for the general economy instead.
+- Be objective; do not manufacture bullish/bearish takes for engagement. A forced crypto stance is worse than a neutral macro observation.
 
-This is NOT a news summary. This is a TRADER'S ANALYSIS explaining WHY this matters and WHAT the market implications are.
+VOCABULARY: risk/reward, liquidity, order flow, structural bid, positioning, capitulation, squeeze, thesis validation, regime shift, repricing.
 
-=== ACCURACY RULES (NON-NEGOTIABLE) ===
+OUTPUT FORMAT: three plain paragraphs separated by blank lines, with NO labels or headers.
+1. Hook + facts: a punchy one-liner, then the key facts (2-3 sentences).
+2. Deep dive: why it matters, second-order effects, market structure, what most people miss (4-6 sentences).
+3. Desk view: the institutional conclusion written naturally (never the label "Stance:"), then 2 tags on the final line - crypto-relevant like $BTC #Macro, purely macro like #Fed #DXY or #Macro #RiskOff.
 
-1. **SINGLE SUBJECT FOCUS:** Analyze ONLY the news item provided. Go DEEP on ONE topic.
+BANNED: labels/headers ([HEADLINE], **Section**, "Tweet 1:"), retail language ("moon", "HODL", "gem", "LFG", "WAGMI"), emojis, hedging ("could go either way", "time will tell")."""
 
-2. **SOURCE-BASED FACTS:** Only cite facts from the news. Do NOT invent numbers or events. You MAY add factual context.
+# User message template for analysis requests
+ANALYSIS_USER_PROMPT = """Analyze this news story for our trading desk.
 
-3. **NO TRADING INSTRUCTIONS:** FORBIDDEN: "Buy", "Sell", "Long", "Short". ALLOWED: "Bullish for...", "We see risk/reward skewed to..."
-
-=== LOGICAL SANITY RULES (CRITICAL) ===
+RULES:
+- NO headers or labels (no [HEADLINE], no **Section**, no "Tweet 1:")
+- Output clean paragraphs separated by blank lines
+- End with your view as a natural sentence + 2 tags on the final line
 
-**NO FORCED CAUSALITY:**
-- Do NOT link niche geopolitical events (e.g., trade disputes in small nations, obscure regional conflicts) to Crypto price action unless there is a DIRECT, PROVEN correlation.
-- Bad example: "Greenland tariffs caused BTC to drop" - This is FAKE and FORCED.
-- If the connection between the news and crypto is weak or speculative, DO NOT fabricate a link.
+**News Story:**
+{news_content}
 
-**OPTIONAL CRYPTO STANCE:**
-- If the news is purely Macro/TradFi (e.g., US tariffs on Europe, regional trade policy), analyze the MACRO impact first:
-  - How does it affect inflation, the Dollar Index (DXY), bond yields, or risk appetite?
-- You do NOT need to force a "Bitcoin Stance" if the link to crypto is weak.
-- If the event has no direct impact on Crypto, simply explain the event and its significance for the general economy.
-- Good example: "US announces tariffs on European nations. This may strengthen the DXY and put pressure on risk assets globally. Markets await Fed response."
+Write the analysis now. Start directly with the hook."""
 
-**OBJECTIVE REPORTING:**
-- Be professional and objective. Do not manufacture bullish/bearish takes for engagement.
-- If the crypto angle is unclear, end with a neutral macro observation rather than a forced crypto stance.
+# Few-shot example sent as a user/assistant pair ahead of the real request
+EXAMPLE_NEWS_CONTENT = """1. **Fed's Goolsbee warns inflation could 'roar back' if central bank independence is compromised**
+   Source: CNBC
+"""
 
-=== TONE & VOCABULARY ===
+EXAMPLE_OUTPUT = """The Fed just blinked. Chicago Fed President Goolsbee warned that inflation could "roar back" if central bank independence is compromised—a rare public acknowledgment of political pressure on monetary policy.
 
-Voice: First-person plural ("We", "Our desk", "Our view")
-Style: Opinionated but professional. Like a morning desk note.
+This isn't routine Fed speak. When a voting member explicitly defends institutional autonomy, it signals internal concern about external interference. Our desk sees this as the Fed pre-positioning narrative defense ahead of potential policy clashes. The subtext: rate cuts may face political headwinds that markets aren't pricing. If independence becomes a campaign issue, expect volatility around FOMC dates to spike.
 
-USE trader language: risk/reward, liquidity, order flow, structural bid, positioning, capitulation, squeeze, thesis validation, regime shift, repricing
+We're treating this as a yellow flag for risk assets. The Fed's credibility is the anchor for long-duration trades—any cracks there ripple through everything from bonds to growth tech to crypto. Cautious on rate-sensitive assets until political noise clears.
 
-=== OUTPUT FORMAT (CRITICAL) ===
+$BTC #Macro"""
 
-Output a CLEAN thread with NO LABELS or HEADERS. Just natural paragraphs separated by double newlines.
+EXAMPLE_MESSAGES = [
+    {"role": "user", "content": ANALYSIS_USER_PROMPT.format(news_content=EXAMPLE_NEWS_CONTENT)},
+    {"role": "assistant", "content": EXAMPLE_OUTPUT},
+]
 
-Structure your response as:
+logger = logging.getLogger(__name__)
 
-PARAGRAPH 1 (Hook + Facts):
-Start with a punchy one-liner hook, then state the key facts from the news. (2-3 sentences total)
+# Collapses runs of blank lines left behind after stripping reasoning traces.
+# Faster than a split("\n\n")/join pass on typical responses, and unlike it
+# also catches whitespace-only lines.
+BLANK_LINES_RE = re.compile(r'\n\s*\n')
 
-PARAGRAPH 2 (Deep Dive):
-Why does this matter? Explain second-order effects, market structure implications, what most people are missing. (4-6 sentences)
+# Matches article IDs in the curation response
+ID_RE = re.compile(r'\d+')
 
-PARAGRAPH 3 (Desk View + Tags):
-State the institutional view directly as the final paragraph. Do NOT use the label 'Stance:'. Just write the conclusion naturally.
-- If crypto-relevant: End with 2 tags like $BTC #Macro
-- If purely macro: End with macro tags like #Fed #DXY or #Macro #RiskOff
-Remember: A forced crypto stance is worse than an objective macro observation.
+# Batch statuses that will never reach "completed"
+BATCH_FAILED_STATUSES = frozenset({"failed", "expired", "cancelled"})
 
-=== BANNED ===
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 
-- ANY labels/headers like [HEADLINE], [THE MECHANICS], **Section**, Tweet 1:, etc.
-- Retail language: "moon", "HODL", "gem", "LFG", "WAGMI"
-- Emojis
-- Hedging: "could go either way", "time will tell"
+# Process-wide HTTP/2 client (no proxies, to avoid Railway proxy issues) so every
+# NewsAnalyzer reuses the same pooled TLS connections to OpenRouter
+SHARED_HTTP_CLIENT = httpx.Client(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+    timeout=httpx.Timeout(60.0, connect=10.0)
+)
 
-=== EXAMPLE OUTPUT ===
 
-The Fed just blinked. Chicago Fed President Goolsbee warned that inflation could "roar back" if central bank independence is compromised—a rare public acknowledgment of political pressure on monetary policy.
+THINK_OPEN = "<think>"
+THINK_CLOSE = "</think>"
 
-This isn't routine Fed speak. When a voting member explicitly defends institutional autonomy, it signals internal concern about external interference. Our desk sees this as the Fed pre-positioning narrative defense ahead of potential policy clashes. The subtext: rate cuts may face political headwinds that markets aren't pricing. If independence becomes a campaign issue, expect volatility around FOMC dates to spike.
 
-We're treating this as a yellow flag for risk assets. The Fed's credibility is the anchor for long-duration trades—any cracks there ripple through everything from bonds to growth tech to crypto. Cautious on rate-sensitive assets until political noise clears.
+class ThinkStripper:
+    """
+    Incrementally strip <think>...</think> reasoning traces from a stream.
 
-$BTC #Macro
-"""
+    Feed chunks as they arrive; only text outside think blocks is returned.
+    A short tail is held back so tags split across chunks are still detected.
+    An unterminated think block is dropped entirely.
+    """
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+    def __init__(self):
+        self._inside = False
+        self._pending = ""
+
+    def feed(self, chunk: str) -> str:
+        """Consume a chunk and return the visible text it completes."""
+        text = self._pending + chunk
+        visible = []
+        start = 0
+
+        while True:
+            if self._inside:
+                end = text.find(THINK_CLOSE, start)
+                if end == -1:
+                    # Keep just enough to match a closing tag split across chunks
+                    self._pending = text[max(start, len(text) - len(THINK_CLOSE) + 1):]
+                    return "".join(visible)
+                start = end + len(THINK_CLOSE)
+                self._inside = False
+            else:
+                begin = text.find(THINK_OPEN, start)
+                if begin == -1:
+                    # Hold back a possible partial opening tag
+                    hold = _partial_tag_length(text, THINK_OPEN)
+                    visible.append(text[start:len(text) - hold])
+                    self._pending = text[len(text) - hold:] if hold else ""
+                    return "".join(visible)
+                visible.append(text[start:begin])
+                start = begin + len(THINK_OPEN)
+                self._inside = True
+
+    def finalize(self) -> str:
+        """Flush any held-back visible text at end of stream."""
+        tail = "" if self._inside else self._pending
+        self._inside = False
+        self._pending = ""
+        return tail
+
+
+def _partial_tag_length(text: str, tag: str) -> int:
+    """Length of the longest suffix of text that is a proper prefix of tag."""
+    for size in range(min(len(tag) - 1, len(text)), 0, -1):
+        if text.endswith(tag[:size]):
+            return size
+    return 0
+
+
+def strip_think(text: str) -> str:
+    """One-shot removal of <think>...</think> blocks from a complete response."""
+    parts = []
+    while True:
+        before, found, rest = text.partition(THINK_OPEN)
+        parts.append(before)
+        if not found:
+            return "".join(parts)
+        _, closed, text = rest.partition(THINK_CLOSE)
+        if not closed:
+            # Unterminated reasoning trace - drop it
+            return "".join(parts)
 
 
 def clean_llm_response(text: str) -> str:
@@ -101,21 +180,15 @@ def clean_llm_response(text: str) -> str:
     if not text:
         return ""
     # Remove all content between <think> and </think> tags (including the tags)
-    cleaned = re.sub(r'<think>.*?</think>', '', text, flags=re.DOTALL)
+    cleaned = strip_think(text)
     # Clean up any extra whitespace left behind
-    cleaned = re.sub(r'\n\s*\n', '\n\n', cleaned).strip()
+    cleaned = BLANK_LINES_RE.sub('\n\n', cleaned).strip()
     return cleaned
 
 
 # System prompt for AI headline curation
 CURATION_PROMPT = """You are a Crypto Fund Manager responsible for filtering news for your investment team.
 
-=== CRITICAL DATE CONTEXT ===
-Today is {current_date}. The current year is {current_year}.
-You must ONLY select news that was released in the last 24 hours.
-REJECT any headlines that reference events from 2025 or earlier as if they are current news.
-If a headline mentions "2025", "2024", or "2023", it is likely stale cached content - SKIP IT.
-
 Your job is to identify the most CRITICAL headlines for institutional investors.
 Prioritize TOPIC DIVERSITY - do not select multiple headlines on the same theme.
 
@@ -149,21 +222,143 @@ Example: 3, 7, 12, 23, 41
 
 Do NOT include any explanation. ONLY output the IDs."""
 
+# Date context for curation - appended to the user message so the system prompt stays static
+CURATION_DATE_CONTEXT = """=== CRITICAL DATE CONTEXT ===
+Today is {current_date}. The current year is {current_year}.
+You must ONLY select news that was released in the last 24 hours.
+REJECT any headlines that reference events from 2025 or earlier as if they are current news.
+If a headline mentions "2025", "2024", or "2023", it is likely stale cached content - SKIP IT."""
+
+# Date context for analysis - appended after SYSTEM_PROMPT
+ANALYSIS_DATE_CONTEXT = """=== CRITICAL DATE CONTEXT (NON-NEGOTIABLE) ===
+
+Today is {current_date}. The current year is {current_year}.
+
+STRICT RULES:
+1. You must ONLY analyze news provided in the context that was released in the last 24 hours.
+2. Do NOT reference historical data from 2025, 2024, or 2023 as if it were current news.
+3. If the news mentions "this year", it means {current_year}.
+4. If any content seems to reference 2025 or 2024 events as recent, IGNORE that content.
+5. All price references, market events, and analysis must be relevant to January {current_year}.
+
+The bot previously posted outdated news causing critical errors. You are the last line of defense."""
+
+
+@functools.lru_cache(maxsize=1)
+def _analysis_date_context(day: date) -> str:
+    """Render ANALYSIS_DATE_CONTEXT once per day."""
+    return ANALYSIS_DATE_CONTEXT.format(current_date=day.strftime("%A, %B %d, %Y"), current_year=day.year)
+
+
+@functools.lru_cache(maxsize=1)
+def _curation_date_context(day: date) -> str:
+    """Render CURATION_DATE_CONTEXT once per day."""
+    return CURATION_DATE_CONTEXT.format(current_date=day.strftime("%A, %B %d, %Y"), current_year=day.year)
+
+
+def uses_cache_control(model: str = LLM_MODEL) -> bool:
+    """Anthropic models need explicit cache_control breakpoints; others cache prefixes automatically."""
+    return model.startswith("anthropic/")
+
+
+def build_example_messages(model: str = LLM_MODEL) -> List[Dict]:
+    """
+    Few-shot example messages for analysis.
+
+    On Anthropic models the last example carries a second cache breakpoint,
+    so the examples are cached together with the system prompt.
+    """
+    if not uses_cache_control(model):
+        return list(EXAMPLE_MESSAGES)
+
+    *head, last = EXAMPLE_MESSAGES
+    cached_last = {
+        "role": last["role"],
+        "content": [{"type": "text", "text": last["content"], "cache_control": {"type": "ephemeral"}}]
+    }
+    return [*head, cached_last]
+
+
+def build_system_message(static_prompt: str, *dynamic_parts: str, model: str = LLM_MODEL) -> Dict:
+    """
+    Build the system message: static prompt first, per-call parts last.
+
+    Anthropic models on OpenRouter only cache content blocks carrying an
+    explicit cache_control breakpoint, so the static prompt goes first as its
+    own block and the per-call parts (date, overrides) follow uncached.
+    Other providers get a plain string; keeping the static text as the prefix
+    lets OpenAI-style automatic prefix caching kick in.
+    """
+    dynamic_parts = [part for part in dynamic_parts if part]
+
+    if uses_cache_control(model):
+        content = [{"type": "text", "text": static_prompt, "cache_control": {"type": "ephemeral"}}]
+        content.extend({"type": "text", "text": part} for part in dynamic_parts)
+        return {"role": "system", "content": content}
+
+    return {"role": "system", "content": "\n\n".join([static_prompt, *dynamic_parts])}
+
+
+def log_cache_usage(response) -> None:
+    """Log prompt-cache hits reported by OpenRouter (if any)."""
+    usage = getattr(response, "usage", None)
+    if not usage:
+        return
+
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", None) if details else None
+    cache_read = getattr(usage, "cache_read_input_tokens", None)
+    cache_write = getattr(usage, "cache_creation_input_tokens", None)
+
+    logger.info(
+        f"Token usage: prompt={usage.prompt_tokens}, completion={usage.completion_tokens}, "
+        f"cached={cached_tokens or cache_read or 0}, cache_write={cache_write or 0}"
+    )
+
+
+def truncate_graphemes(text: str, limit: int) -> str:
+    """
+    Cut text to at most limit characters without splitting a grapheme cluster.
+
+    Uses Unicode extended grapheme cluster boundaries, so combining marks,
+    ZWJ emoji sequences and flag pairs stay whole (X rejects broken ones).
+    """
+    return text[:grapheme.safe_split_index(text, limit)]
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """True for failures worth retrying: timeouts, connection errors, 429 and 5xx."""
+    if isinstance(exc, (httpx.TimeoutException, openai.APIConnectionError, openai.RateLimitError)):
+        return True
+    return isinstance(exc, openai.APIStatusError) and exc.status_code >= 500
+
 
 class NewsAnalyzer:
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, batch_mode: bool = False):
         self.api_key = api_key or os.getenv("OPENROUTER_API_KEY")
         if not self.api_key:
             raise ValueError("OPENROUTER_API_KEY not found in environment")
 
-        # Create httpx client without proxies to avoid Railway proxy issues
-        http_client = httpx.Client()
+        # Retries are handled by _create_completion, so disable the SDK's own
         self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
+            base_url=OPENROUTER_BASE_URL,
             api_key=self.api_key,
-            http_client=http_client
+            http_client=SHARED_HTTP_CLIENT,
+            max_retries=0
         )
 
+        # OpenRouter has no Batch API, so offline runs go to a batch-capable endpoint
+        self.batch_client = None
+        if batch_mode:
+            batch_api_key = os.getenv("OPENAI_API_KEY")
+            if not batch_api_key:
+                raise ValueError("OPENAI_API_KEY not found in environment (required for batch mode)")
+            self.batch_client = OpenAI(
+                base_url=BATCH_API_BASE_URL,
+                api_key=batch_api_key,
+                http_client=SHARED_HTTP_CLIENT
+            )
+
     def select_top_headlines(self, headlines: List[Dict], top_k: int = 5, topic: str = None) -> List[int]:
         """
         Use AI to select the most important headlines for institutional investors.
@@ -179,6 +374,9 @@ class NewsAnalyzer:
         if not headlines:
             logger.warning("No headlines to curate")
             return []
+        if top_k <= 0:
+            logger.warning(f"Nothing to select (top_k={top_k})")
+            return []
 
         # Apply topic filter if provided
         if topic:
@@ -190,11 +388,19 @@ class NewsAnalyzer:
             else:
                 logger.warning(f"Topic '{topic}' not found in any headlines. Reverting to auto-mode.")
 
+        # Nothing to choose between - skip the LLM round-trip
+        if len(headlines) <= top_k:
+            ids = [h["id"] for h in headlines]
+            logger.info(f"Skipping AI curation: {len(ids)} headlines <= top_k={top_k}")
+            return ids
+
+        valid_ids = frozenset(h["id"] for h in headlines)
+
         # Format headlines for the LLM
-        headlines_text = "\n".join([
+        headlines_text = "\n".join(
             f"[{h['id']}] {h['title']} (Source: {h['source']})"
             for h in headlines
-        ])
+        )
 
         user_prompt = f"""Review these {len(headlines)} headlines and select the TOP {top_k} most critical for institutional crypto investors.
 
@@ -205,41 +411,35 @@ Return ONLY the {top_k} IDs, separated by commas (e.g., 3, 7, 12, 23, 41):"""
         try:
             logger.info(f"AI curating {len(headlines)} headlines...")
 
-            # Inject current date into curation prompt to prevent selecting stale news
-            current_date = datetime.now().strftime("%A, %B %d, %Y")
-            current_year = datetime.now().year
-            dynamic_curation_prompt = CURATION_PROMPT.format(
-                current_date=current_date,
-                current_year=current_year
-            )
+            # Inject current date after the headlines to prevent selecting stale news;
+            # the system prompt stays fully static so it can be prefix-cached
+            date_context = _curation_date_context(date.today())
 
-            response = self.client.chat.completions.create(
+            raw_response = self._stream_completion(
                 model=LLM_MODEL,
                 max_tokens=100,
+                # IDs fit in a few tokens; skip paying for a reasoning trace we'd discard
+                extra_body={"reasoning": {"effort": "low", "exclude": True}},
                 messages=[
-                    {"role": "system", "content": dynamic_curation_prompt},
-                    {"role": "user", "content": user_prompt}
+                    build_system_message(CURATION_PROMPT),
+                    {"role": "user", "content": f"{user_prompt}\n\n{date_context}"}
                 ]
             )
 
-            raw_response = response.choices[0].message.content or ""
-
             # Clean LLM response (remove <think>...</think> reasoning traces)
             response_text = clean_llm_response(raw_response)
             logger.info(f"AI selected IDs: {response_text}")
 
-            # Parse the IDs from response
-            selected_ids = []
-            for part in response_text.replace(" ", "").split(","):
-                try:
-                    selected_ids.append(int(part))
-                except ValueError:
-                    continue
+            # Parse the IDs from response (tolerates "IDs: 3, 7, and 12" style output)
+            selected_ids = [int(m.group(0)) for m in ID_RE.finditer(response_text)]
 
             # Validate IDs exist in headlines
-            valid_ids = {h["id"] for h in headlines}
             selected_ids = [id for id in selected_ids if id in valid_ids][:top_k]
 
+            if not selected_ids:
+                logger.warning("No valid IDs in AI response. Falling back to first headlines.")
+                return [h["id"] for h in headlines[:top_k]]
+
             logger.info(f"AI selected {len(selected_ids)} articles: {selected_ids}")
             return selected_ids
 
@@ -266,38 +466,191 @@ Return ONLY the {top_k} IDs, separated by commas (e.g., 3, 7, 12, 23, 41):"""
             logger.warning("No articles to analyze")
             return []
 
-        # Inject current date into system prompt to prevent temporal hallucinations
-        current_date = datetime.now().strftime("%A, %B %d, %Y")
-        current_year = datetime.now().year
-        date_context = f"""=== CRITICAL DATE CONTEXT (NON-NEGOTIABLE) ===
+        messages = self._build_analysis_messages(articles, override_context)
 
-Today is {current_date}. The current year is {current_year}.
+        try:
+            logger.info("Sending articles to LLM for institutional analysis...")
 
-STRICT RULES:
-1. You must ONLY analyze news provided in the context that was released in the last 24 hours.
-2. Do NOT reference historical data from 2025, 2024, or 2023 as if it were current news.
-3. If the news mentions "this year", it means {current_year}.
-4. If any content seems to reference 2025 or 2024 events as recent, IGNORE that content.
-5. All price references, market events, and analysis must be relevant to January {current_year}.
+            # Stream from OpenRouter, stopping once the post would be truncated anyway
+            raw_response = self._stream_completion(
+                max_chars=MAX_TWEET_LENGTH,
+                model=LLM_MODEL,
+                max_tokens=1024,
+                extra_body={"reasoning": {"max_tokens": LLM_REASONING_MAX_TOKENS}},
+                messages=messages
+            )
 
-The bot previously posted outdated news causing critical errors. You are the last line of defense.
+            return self._tweets_from_text(raw_response)
 
-"""
-        dynamic_system_prompt = date_context + SYSTEM_PROMPT
+        except Exception as e:
+            logger.error(f"Error calling LLM API: {e}")
+            return []
+
+    def embed_text(self, text: str) -> Optional[List[float]]:
+        """
+        Embed text for the semantic analysis cache.
+
+        Returns:
+            Embedding vector, or None if the embedding call failed
+        """
+        try:
+            response = self.client.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=text,
+                timeout=LLM_REQUEST_TIMEOUT
+            )
+            return response.data[0].embedding
+        except Exception as e:
+            logger.warning(f"Embedding failed, semantic cache disabled for this run: {e}")
+            return None
+
+    async def analyze_news_async(self, articles_batches: List[List[Dict]]) -> List[List[str]]:
+        """
+        Analyze several article sets concurrently.
+
+        Each set becomes its own LLM call; calls run in parallel (bounded by
+        LLM_MAX_CONCURRENCY) so OpenRouter can batch them server-side.
+
+        Args:
+            articles_batches: List of article lists, one analysis per list
+
+        Returns:
+            List of tweet lists, in the same order as articles_batches
+        """
+        semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+        # Async clients are bound to the running event loop, so create one per run
+        async with AsyncOpenAI(
+            base_url=OPENROUTER_BASE_URL,
+            api_key=self.api_key,
+            http_client=httpx.AsyncClient(limits=httpx.Limits(max_connections=20))
+        ) as aclient:
+
+            async def analyze_one(articles: List[Dict]) -> List[str]:
+                if not articles:
+                    return []
+                async with semaphore:
+                    try:
+                        response = await aclient.chat.completions.create(
+                            timeout=LLM_REQUEST_TIMEOUT,
+                            model=LLM_MODEL,
+                            max_tokens=1024,
+                            extra_body={"reasoning": {"max_tokens": LLM_REASONING_MAX_TOKENS}},
+                            messages=self._build_analysis_messages(articles)
+                        )
+                        log_cache_usage(response)
+                        return self._tweets_from_text(response.choices[0].message.content or "")
+                    except Exception as e:
+                        logger.error(f"Error calling LLM API: {e}")
+                        return []
+
+            logger.info(f"Sending {len(articles_batches)} article sets to LLM concurrently...")
+            return await asyncio.gather(*[analyze_one(articles) for articles in articles_batches])
+
+    def analyze_news_batch(self, articles_batches: List[List[Dict]]) -> List[List[str]]:
+        """Synchronous wrapper around analyze_news_async."""
+        return asyncio.run(self.analyze_news_async(articles_batches))
+
+    def submit_batch(self, articles_list: List[List[Dict]]) -> str:
+        """
+        Submit article sets to the Batch API for offline analysis (~50% cheaper).
+
+        Args:
+            articles_list: List of article lists, one analysis per list
+
+        Returns:
+            Batch ID to pass to poll_batch()
+        """
+        self._require_batch_mode()
+
+        lines = [
+            json.dumps({
+                "custom_id": f"analysis-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": BATCH_LLM_MODEL,
+                    "max_tokens": 1024,
+                    "messages": self._build_analysis_messages(articles, model=BATCH_LLM_MODEL)
+                }
+            })
+            for i, articles in enumerate(articles_list)
+        ]
+
+        batch_file = self.batch_client.files.create(
+            file=("analysis_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = self.batch_client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+
+        logger.info(f"Submitted batch {batch.id} with {len(lines)} analyses")
+        return batch.id
+
+    def poll_batch(self, batch_id: str) -> Optional[List[List[str]]]:
+        """
+        Check a submitted batch and collect its tweets once complete.
+
+        Args:
+            batch_id: ID returned by submit_batch()
+
+        Returns:
+            List of tweet lists in submission order, or None if not finished yet
+
+        Raises:
+            RuntimeError: If the batch failed, expired or was cancelled
+        """
+        self._require_batch_mode()
+
+        batch = self.batch_client.batches.retrieve(batch_id)
+        if batch.status in BATCH_FAILED_STATUSES:
+            raise RuntimeError(f"Batch {batch_id} ended with status {batch.status}")
+        if batch.status != "completed":
+            logger.info(f"Batch {batch_id} status: {batch.status}")
+            return None
+
+        results: Dict[int, List[str]] = {}
+        if batch.output_file_id:
+            output = self.batch_client.files.content(batch.output_file_id).text
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                index = int(result["custom_id"].rsplit("-", 1)[1])
+                response = result.get("response") or {}
+                if response.get("status_code") != 200:
+                    logger.error(f"Batch request {result['custom_id']} failed: {result.get('error')}")
+                    continue
+                content = response["body"]["choices"][0]["message"]["content"] or ""
+                results[index] = self._tweets_from_text(content)
+
+        total = batch.request_counts.total if batch.request_counts else len(results)
+        logger.info(f"Batch {batch_id} completed: {len(results)}/{total} analyses succeeded")
+        return [results.get(i, []) for i in range(total)]
+
+    def _require_batch_mode(self):
+        """Raise if this analyzer was not constructed with batch_mode=True."""
+        if not self.batch_client:
+            raise RuntimeError("Batch mode is disabled; construct NewsAnalyzer(batch_mode=True)")
+
+    def _build_analysis_messages(self, articles: List[Dict], override_context: str = None,
+                                 model: str = LLM_MODEL) -> List[Dict]:
+        """Build the chat messages for a single analysis call, shaped for the given model."""
+        # Append current date after the static persona prompt to prevent temporal hallucinations
+        date_context = _analysis_date_context(date.today())
 
         # Inject priority override into system prompt if provided
+        override_injection = ""
         if override_context:
-            override_injection = f"""
-
-=== CRITICAL CONTEXT (PRIORITY OVERRIDE) ===
+            override_injection = f"""=== CRITICAL CONTEXT (PRIORITY OVERRIDE) ===
 The user has provided this expert analysis. You MUST use these specific arguments, data points, and logic as the CORE of your tweet. Do not deviate from this narrative.
 
 {override_context}
 
-=== END PRIORITY OVERRIDE ===
-
-"""
-            dynamic_system_prompt += override_injection
+=== END PRIORITY OVERRIDE ==="""
             logger.info("Priority override context injected into system prompt")
 
         # Build user prompt based on whether we have articles or override
@@ -307,65 +660,91 @@ The user has provided this expert analysis. You MUST use these specific argument
             news_content = self._format_articles(articles)
 
         # User message with the news data
-        user_prompt = f"""Analyze this news story for our trading desk.
+        user_prompt = ANALYSIS_USER_PROMPT.format(news_content=news_content)
+
+        return [
+            build_system_message(SYSTEM_PROMPT, date_context, override_injection, model=model),
+            *build_example_messages(model),
+            {"role": "user", "content": user_prompt}
+        ]
+
+    @retry(
+        retry=retry_if_exception(is_transient_error),
+        wait=wait_exponential(multiplier=1, max=10),
+        stop=stop_after_attempt(3),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True
+    )
+    def _create_completion(self, **kwargs):
+        """Create a chat completion, retrying transient failures with backoff."""
+        return self.client.chat.completions.create(timeout=LLM_REQUEST_TIMEOUT, **kwargs)
+
+    def _stream_completion(self, max_chars: int = None, **kwargs) -> str:
+        """
+        Stream a chat completion and return the accumulated visible text.
 
-RULES:
-- NO headers or labels (no [HEADLINE], no **Section**, no "Tweet 1:")
-- Output clean paragraphs separated by blank lines
-- End with your view as a natural sentence + 2 tags on the final line
+        Reasoning traces are stripped chunk-by-chunk, so <think> content is
+        never accumulated.
 
-**News Story:**
-{news_content}
+        Args:
+            max_chars: Stop generating once the visible (non-reasoning) text
+                exceeds this many characters
+            **kwargs: Passed through to chat.completions.create
 
-Write the analysis now. Start directly with the hook."""
+        Returns:
+            Response text with <think> traces removed
+        """
+        stream = self._create_completion(
+            stream=True,
+            stream_options={"include_usage": True},
+            **kwargs
+        )
 
+        buffer = io.StringIO()
+        stripper = ThinkStripper()
         try:
-            logger.info("Sending articles to LLM for institutional analysis...")
+            for chunk in stream:
+                # The final chunk carries usage and no choices
+                if not chunk.choices:
+                    log_cache_usage(chunk)
+                    continue
 
-            # Call OpenRouter API with system prompt for persona
-            response = self.client.chat.completions.create(
-                model=LLM_MODEL,
-                max_tokens=1024,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": dynamic_system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": user_prompt
-                    }
-                ]
-            )
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                buffer.write(stripper.feed(delta))
 
-            # Extract the response
-            raw_response = response.choices[0].message.content or ""
-            logger.info(f"LLM response received: {len(raw_response)} characters")
+                if max_chars and buffer.tell() > max_chars:
+                    logger.info(f"Response exceeded {max_chars} characters, stopping stream early")
+                    break
+        finally:
+            stream.close()
 
-            # Clean LLM response (remove <think>...</think> reasoning traces)
-            response_text = clean_llm_response(raw_response)
+        buffer.write(stripper.finalize())
+        return buffer.getvalue()
 
-            # Parse tweets from response
-            tweets = self._parse_tweets(response_text)
+    def _tweets_from_text(self, raw_response: str) -> List[str]:
+        """Clean and parse tweets from a raw LLM response."""
+        logger.info(f"LLM response received: {len(raw_response)} characters")
 
-            return tweets
+        # Clean LLM response (remove <think>...</think> reasoning traces)
+        response_text = clean_llm_response(raw_response)
+
+        # Parse tweets from response
+        return self._parse_tweets(response_text)
 
-        except Exception as e:
-            logger.error(f"Error calling LLM API: {e}")
-            return []
-    
     def _format_articles(self, articles: List[Dict]) -> str:
         """Format articles into a readable text block for LLM."""
-        formatted = []
-        
+        buffer = io.StringIO()
+
         for i, article in enumerate(articles, 1):
-            formatted.append(f"{i}. **{article['title']}**")
-            formatted.append(f"   Source: {article['source']}")
-            if article.get('summary'):
-                formatted.append(f"   Summary: {article['summary']}")
-            formatted.append("")  # Blank line
-        
-        return "\n".join(formatted)
+            buffer.write(f"{i}. **{article['title']}**\n   Source: {article['source']}\n")
+            summary = article.get('summary')
+            if summary:
+                buffer.write(f"   Summary: {summary}\n")
+            buffer.write("\n")  # Blank line
+
+        return buffer.getvalue()
     
     def _parse_tweets(self, response: str) -> List[str]:
         """
@@ -382,7 +761,7 @@ Write the analysis now. Start directly with the hook."""
 
         # Truncate if exceeds X Premium limit
         if len(cleaned) > MAX_TWEET_LENGTH:
-            cleaned = cleaned[:MAX_TWEET_LENGTH - 3] + "..."
+            cleaned = truncate_graphemes(cleaned, MAX_TWEET_LENGTH - 3) + "..."
 
         # Return as single post (X Premium deep-dive format)
         return [cleaned]
@@ -16,6 +16,10 @@ RSS_FEEDS = [
     "https://decrypt.co/feed",
 ]
 
+FEED_FETCH_WORKERS = 8  # Max RSS feeds downloaded in parallel
+FEED_TIMEOUT_SECONDS = 10  # Per-feed HTTP timeout
+FEED_USER_AGENT = "crypto-bot/1.0"
+
 # Claude Analysis Prompt - Institutional Macro Strategist
 ANALYSIS_PROMPT = """You are an Institutional Macro Strategist at a crypto-focused secondary fund. Your role is to synthesize market-moving information into actionable intelligence for portfolio managers—NOT to aggregate news for retail audiences.
 
@@ -81,10 +85,26 @@ MAX_TWEET_LENGTH = 4000  # X Premium allows up to 4000 chars
 TWEETS_PER_BATCH = 1     # Single deep-dive per run
 TWEETS_PER_DAY = 1       # One high-quality summary per day
 SCAN_INTERVAL_HOURS = 24 # Daily run: look back full 24 hours
+INTER_TWEET_DELAY_SECONDS = 2       # Pause between tweets in a thread
+MAX_INTER_TWEET_DELAY_SECONDS = 60  # Longest wait before retrying a 429 (backoff or reset header)
+TWEET_RETRY_ATTEMPTS = 3            # Attempts per tweet when rate limited
 
 # LLM Configuration (via OpenRouter)
 # DeepSeek V3 - stable, follows instructions well
 LLM_MODEL = "deepseek/deepseek-chat"
+LLM_MAX_CONCURRENCY = 10  # Max parallel LLM calls in analyze_news_async
+LLM_REQUEST_TIMEOUT = 30   # Per-attempt timeout (seconds); transient failures are retried
+LLM_REASONING_MAX_TOKENS = 256  # Cap on reasoning-model think budget for analysis
+
+# Semantic analysis cache - reuse a recent analysis when the story is a paraphrase
+EMBEDDING_MODEL = "openai/text-embedding-3-small"
+SEMANTIC_CACHE_THRESHOLD = 0.92  # Minimum cosine similarity for a cache hit
+SEMANTIC_CACHE_TTL_HOURS = 24    # Ignore cached analyses older than this
+
+# Batch API (offline runs, ~50% cheaper) - OpenRouter has no Batch API,
+# so batch mode talks to OpenAI directly with an OpenAI model name
+BATCH_API_BASE_URL = "https://api.openai.com/v1"
+BATCH_LLM_MODEL = "gpt-4o-mini"
 
 # Production Mode - Live posting enabled
 DRY_RUN = False
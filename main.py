@@ -2,16 +2,17 @@
 
 import os
 import sys
+import asyncio
+import json
 import argparse
 import logging
 from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
 from dotenv import load_dotenv
 
 import config
-from news_fetcher import NewsFetcher
-from analyzer import NewsAnalyzer
 from poster import TwitterPoster
-from storage import NewsStorage
 
 # Load environment variables (override=True to pick up .env changes)
 load_dotenv(override=True)
@@ -23,6 +24,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Structured post history, one JSON object per line
+ARCHIVE_FILE = "tweet_archive.jsonl"
+
 
 class CryptoTwitterBot:
     def __init__(self, hours_override: int = None, topic_filter: str = None):
@@ -30,10 +34,8 @@ class CryptoTwitterBot:
         logger.info("Initializing Crypto Twitter Bot...")
 
         try:
-            self.fetcher = NewsFetcher()
-            self.analyzer = NewsAnalyzer()
+            self._init_fetching_components()
             self.poster = TwitterPoster()
-            self.storage = NewsStorage()
 
             # Configuration
             self.scan_interval = int(os.getenv("SCAN_INTERVAL_HOURS", 8))
@@ -50,7 +52,21 @@ class CryptoTwitterBot:
             logger.error(f"Failed to initialize bot: {e}")
             sys.exit(1)
 
-    def run_cycle(self):
+    def _init_fetching_components(self):
+        """Build the fetch/analyze/storage stack.
+
+        Imported here rather than at module load so that ``--retry-post``,
+        which only needs TwitterPoster, skips the feed, LLM and SQLite imports.
+        """
+        from news_fetcher import NewsFetcher
+        from analyzer import NewsAnalyzer
+        from storage import NewsStorage
+
+        self.storage = NewsStorage()
+        self.fetcher = NewsFetcher(storage=self.storage)
+        self.analyzer = NewsAnalyzer()
+
+    async def run_cycle(self):
         """Run one complete cycle: fetch, curate, analyze, and post."""
         logger.info("=" * 60)
         logger.info(f"Starting bot cycle at {datetime.now()}")
@@ -77,22 +93,9 @@ class CryptoTwitterBot:
 
                 logger.info(f"Generated override tweet ({len(tweets)} part(s))")
 
-                # Save draft
-                tweet_content = "\n\n---\n\n".join(tweets)
-                with open("latest_tweet.md", "w") as f:
-                    f.write(tweet_content)
-                print("Draft saved to latest_tweet.md")
-
-                # Archive
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-                with open("tweet_archive.md", "a") as f:
-                    f.write(f"\n\n--- [{timestamp}] [OVERRIDE] ---\n\n")
-                    f.write(tweet_content)
-                print("Archived to tweet_archive.md")
-
-                # Post to Twitter
+                # Post to Twitter while the draft/archive files are written
                 logger.info("Posting override tweet to Twitter...")
-                success = self.poster.post_thread(tweets)
+                success = await self._post_and_save(tweets, override=True)
 
                 if success:
                     logger.info("Override tweet posted successfully!")
@@ -131,11 +134,8 @@ class CryptoTwitterBot:
             for i, article in enumerate(selected_articles, 1):
                 logger.info(f"  [{i}] {article['title'][:60]}...")
 
-            # Step 4: Check if already posted
-            new_articles = []
-            for article in selected_articles:
-                if not self.storage.is_already_posted(article["title"], article["source"]):
-                    new_articles.append(article)
+            # Step 4: Check if already posted (hash each article once, one query)
+            new_articles = self.storage.filter_unposted(selected_articles)
 
             if not new_articles:
                 logger.warning("All selected articles have been posted before. Skipping this cycle.")
@@ -143,9 +143,31 @@ class CryptoTwitterBot:
 
             logger.info(f"Step 4: Found {len(new_articles)} new articles to analyze")
 
-            # Step 5: Deep analysis with LLM
+            # Step 5: Deep analysis with LLM, unless a recent analysis covers the same story
             logger.info("Step 5: Deep analysis with LLM...")
-            tweets = self.analyzer.analyze_news(new_articles)
+            cache_text = "|".join(a["title"] for a in new_articles)
+            embedding = self.analyzer.embed_text(cache_text)
+            cached_tweets = None
+            if embedding:
+                cached_tweets = self.storage.find_similar_analysis(
+                    embedding, config.SEMANTIC_CACHE_THRESHOLD, config.SEMANTIC_CACHE_TTL_HOURS
+                )
+
+            if cached_tweets:
+                # Re-posting identical text would be rejected by X as a duplicate
+                if self.storage.is_tweet_posted("\n".join(cached_tweets)):
+                    # Mark them so curation moves on instead of re-picking this story all TTL long
+                    self._mark_posted(new_articles, cached_tweets)
+                    logger.warning("Story already covered by a recent post (semantic match). Skipping this cycle.")
+                    return
+                logger.info("Reusing cached analysis of a near-identical story (semantic match)")
+                tweets = cached_tweets
+            else:
+                tweets = self.analyzer.analyze_news(new_articles)
+                if tweets and embedding:
+                    self.storage.save_analysis(
+                        cache_text, embedding, tweets, config.SEMANTIC_CACHE_TTL_HOURS
+                    )
 
             if not tweets:
                 logger.warning("No tweets generated from analysis. Skipping this cycle.")
@@ -155,32 +177,12 @@ class CryptoTwitterBot:
             for i, tweet in enumerate(tweets, 1):
                 logger.info(f"  Part {i}: {tweet[:60]}...")
 
-            # Save draft to file for easy review
-            tweet_content = "\n\n---\n\n".join(tweets)
-            with open("latest_tweet.md", "w") as f:
-                f.write(tweet_content)
-            print("Draft saved to latest_tweet.md")
-
-            # Archive to persistent history file
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-            with open("tweet_archive.md", "a") as f:
-                f.write(f"\n\n--- [{timestamp}] ---\n\n")
-                f.write(tweet_content)
-            print("Archived to tweet_archive.md")
-
-            # Step 7: Post to Twitter
+            # Step 7: Post to Twitter while the draft/archive files are written
             logger.info("Step 7: Posting to Twitter...")
-            success = self.poster.post_thread(tweets)
+            success = await self._post_and_save(tweets, new_articles)
 
             if success:
-                # Mark articles as posted
-                tweet_text = "\n".join(tweets)
-                for article in new_articles:
-                    self.storage.mark_as_posted(
-                        article["title"],
-                        article["source"],
-                        tweet_text
-                    )
+                self._mark_posted(new_articles, tweets)
                 logger.info("✓ Cycle completed successfully!")
             else:
                 logger.error("✗ Failed to post tweets")
@@ -188,6 +190,51 @@ class CryptoTwitterBot:
         except Exception as e:
             logger.error(f"Error during bot cycle: {e}", exc_info=True)
 
+    def _mark_posted(self, articles: List[Dict], tweets: List[str]):
+        """Record the articles as posted with the thread text that covered them."""
+        tweet_text = "\n".join(tweets)
+        for article in articles:
+            self.storage.mark_as_posted(article["title"], article["source"], tweet_text)
+
+    async def _post_and_save(self, tweets: List[str], articles: List[Dict] = None,
+                             override: bool = False) -> bool:
+        """Post the thread while the draft/archive files are written.
+
+        A failed save is only logged: it must not cancel a post in flight or
+        skip marking the articles as posted.
+        """
+        success, saved = await asyncio.gather(
+            self.poster.post_thread(tweets),
+            asyncio.to_thread(self._save_draft, tweets, articles, override),
+            return_exceptions=True
+        )
+        if isinstance(saved, BaseException):
+            logger.error(f"Failed to save draft/archive: {saved}")
+        if isinstance(success, BaseException):
+            raise success
+        return success
+
+    def _save_draft(self, tweets: List[str], articles: List[Dict] = None, override: bool = False):
+        """Save the draft for review/--retry-post and append it to the JSONL archive."""
+        Path("latest_tweet.md").write_text("\n\n---\n\n".join(tweets))
+        print("Draft saved to latest_tweet.md")
+
+        record = {
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "override": override,
+            "tweets": tweets,
+            "articles": [{"title": a["title"], "source": a["source"]} for a in articles or []],
+        }
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+        # Single O_APPEND write so overlapping runs can't interleave records
+        fd = os.open(ARCHIVE_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+        print(f"Archived to {ARCHIVE_FILE}")
+
     def test_apis(self):
         """Test API connections before running."""
         logger.info("Testing API connections...")
@@ -205,6 +252,36 @@ class CryptoTwitterBot:
         return True
 
 
+def retry_post(skip_test: bool = False):
+    """Re-post the content of latest_tweet.md without fetching or analyzing."""
+    try:
+        with open("latest_tweet.md", "r") as f:
+            tweet_content = f.read().strip()
+    except FileNotFoundError:
+        logger.error("latest_tweet.md not found. Run the bot first to generate content.")
+        sys.exit(1)
+    if not tweet_content:
+        logger.error("latest_tweet.md is empty. Nothing to retry.")
+        sys.exit(1)
+
+    try:
+        poster = TwitterPoster()
+    except Exception as e:
+        logger.error(f"Failed to initialize poster: {e}")
+        sys.exit(1)
+
+    if not skip_test and not poster.test_connection():
+        logger.error("Twitter API test failed! Please check your credentials.")
+        sys.exit(1)
+
+    print(f"RETRY MODE: Posting content from latest_tweet.md ({len(tweet_content)} chars)")
+    success = asyncio.run(poster.post_thread([tweet_content]))
+    if success:
+        logger.info("✓ Retry post completed successfully!")
+    else:
+        logger.error("✗ Retry post failed")
+
+
 def main():
     """Main entry point - runs once and exits (suitable for cron)."""
     print("""
@@ -237,6 +314,13 @@ def main():
     else:
         print("LIVE MODE: Posting to Twitter enabled!")
 
+    # Handle --retry-post: re-post from latest_tweet.md with only the poster,
+    # before the fetch/analyze/storage stack is imported
+    if args.retry_post:
+        retry_post(skip_test=args.skip_test)
+        logger.info("Bot execution complete. Exiting.")
+        return
+
     # Initialize bot with optional overrides
     bot = CryptoTwitterBot(hours_override=args.hours, topic_filter=args.topic)
 
@@ -258,26 +342,8 @@ def main():
             logger.error("API tests failed. Please check your credentials.")
             sys.exit(1)
 
-    # Handle --retry-post: re-post from latest_tweet.md
-    if args.retry_post:
-        try:
-            with open("latest_tweet.md", "r") as f:
-                tweet_content = f.read().strip()
-            if not tweet_content:
-                logger.error("latest_tweet.md is empty. Nothing to retry.")
-                sys.exit(1)
-            print(f"RETRY MODE: Posting content from latest_tweet.md ({len(tweet_content)} chars)")
-            success = bot.poster.post_thread([tweet_content])
-            if success:
-                logger.info("✓ Retry post completed successfully!")
-            else:
-                logger.error("✗ Retry post failed")
-        except FileNotFoundError:
-            logger.error("latest_tweet.md not found. Run the bot first to generate content.")
-            sys.exit(1)
-    else:
-        # Run normal cycle
-        bot.run_cycle()
+    # Run normal cycle
+    asyncio.run(bot.run_cycle())
 
     logger.info("Bot execution complete. Exiting.")
 
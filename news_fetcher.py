@@ -1,16 +1,27 @@
 """News fetcher module to collect articles from RSS feeds."""
 
+import email.utils
+import functools
+import heapq
+import io
 import feedparser
 import re
-from datetime import datetime, timedelta
-from typing import List, Dict
+import httpx
+from lxml import etree
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
+from typing import List, Dict, Optional, Tuple
 import logging
 
-from config import RSS_FEEDS
+from config import RSS_FEEDS, FEED_FETCH_WORKERS, FEED_TIMEOUT_SECONDS, FEED_USER_AGENT
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Early exit when scanning a (newest-first) feed
+MAX_ENTRIES_PER_FEED = 30  # Hard cap on entries processed per feed
+STALE_STREAK_LIMIT = 2     # Stop after this many consecutive entries older than the cutoff
+
 # ============================================================
 # STRICT 24-HOUR HARD FILTER - Prevents posting outdated news
 # ============================================================
@@ -18,6 +29,98 @@ STRICT_24H_FILTER = True  # Set to False to disable (NOT recommended)
 STALE_YEAR_PATTERNS = [r'\b2025\b', r'\b2024\b', r'\b2023\b', r'\b2022\b']  # Years to reject (current year is 2026)
 
 
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+DC_NS = "{http://purl.org/dc/elements/1.1/}"
+FEED_ITEM_TAGS = ("item", f"{ATOM_NS}entry")
+
+
+def _to_local_naive(value: datetime) -> datetime:
+    """Convert to naive local time, matching the datetime.now() cutoffs used throughout."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)  # Undated offsets are treated as UTC, like feedparser
+    return value.astimezone().replace(tzinfo=None)
+
+
+@functools.lru_cache(maxsize=2048)
+def _parse_date_str(raw_date: str) -> Optional[datetime]:
+    """
+    Parse an RFC-822 (RSS pubDate) or ISO-8601 (Atom) date string.
+
+    Memoized: feeds repeat the same entries across runs within a process.
+    """
+    raw_date = raw_date.strip()
+    try:
+        return _to_local_naive(email.utils.parsedate_to_datetime(raw_date))
+    except (TypeError, ValueError, IndexError):
+        pass
+    try:
+        return _to_local_naive(datetime.fromisoformat(raw_date.replace("Z", "+00:00")))
+    except ValueError:
+        return None
+
+
+def _atom_link(elem) -> str:
+    """href of an Atom entry's alternate link (rel="alternate" or no rel), like feedparser's entry.link."""
+    for link in elem.iterfind(f"{ATOM_NS}link"):
+        if link.get("rel", "alternate") == "alternate":
+            return link.get("href", "")
+    return ""
+
+
+def parse_feed_stream(content: bytes) -> feedparser.FeedParserDict:
+    """
+    Parse RSS/Atom bytes with lxml, extracting only the fields we use.
+
+    Much cheaper than feedparser's full normalization and sanitization.
+    Returns a FeedParserDict shaped like feedparser's output (feed.title,
+    entries[].title/link/summary/published).
+
+    Raises:
+        ValueError: If no items could be found (caller should fall back to feedparser)
+    """
+    entries = []
+    context = etree.iterparse(
+        io.BytesIO(content),
+        events=("end",),
+        tag=FEED_ITEM_TAGS,
+        resolve_entities=False,
+        no_network=True
+    )
+
+    for _, elem in context:
+        if elem.tag == "item":
+            published = elem.findtext("pubDate") or elem.findtext(f"{DC_NS}date")
+            entry = feedparser.FeedParserDict(
+                title=elem.findtext("title"),
+                link=(elem.findtext("link") or "").strip(),
+                summary=elem.findtext("description") or "",
+            )
+        else:
+            published = elem.findtext(f"{ATOM_NS}published") or elem.findtext(f"{ATOM_NS}updated")
+            entry = feedparser.FeedParserDict(
+                title=elem.findtext(f"{ATOM_NS}title"),
+                link=_atom_link(elem),
+                summary=elem.findtext(f"{ATOM_NS}summary") or elem.findtext(f"{ATOM_NS}content") or "",
+            )
+
+        # Drop missing fields so entry.get() defaults still apply
+        entry = feedparser.FeedParserDict({k: v for k, v in entry.items() if v is not None})
+        if published:
+            entry["published"] = published
+        entries.append(entry)
+
+        # Free the item's subtree; channel-level elements are kept for the title
+        elem.clear(keep_tail=True)
+
+    if not entries:
+        raise ValueError("No <item>/<entry> elements found")
+
+    root = context.root
+    title = root.findtext("channel/title") or root.findtext(f"{ATOM_NS}title")
+    feed_info = feedparser.FeedParserDict(title=title) if title else feedparser.FeedParserDict()
+    return feedparser.FeedParserDict(feed=feed_info, entries=entries)
+
+
 def filter_stale_articles(articles: List[Dict], max_age_hours: int = 24) -> List[Dict]:
     """
     STALE DATA FIREWALL: Remove any articles older than max_age_hours.
@@ -78,9 +181,20 @@ def filter_stale_articles(articles: List[Dict], max_age_hours: int = 24) -> List
 
 
 class NewsFetcher:
-    def __init__(self, feeds: List[str] = None):
+    def __init__(self, feeds: List[str] = None, storage=None):
         self.feeds = feeds or RSS_FEEDS
+        self.storage = storage  # Optional NewsStorage for ETag/Last-Modified persistence
         self._articles_cache: Dict[int, Dict] = {}  # Cache for full article lookup
+        # Last (etag, modified, articles) per feed URL, reused when the server answers 304
+        self._feed_cache: Dict[str, Tuple[Optional[str], Optional[str], List[Dict]]] = {}
+        # One pooled HTTP/2 client for all feed GETs: TLS handshakes are reused and
+        # httpx negotiates compressed transfer (Accept-Encoding) by default
+        self._http = httpx.Client(
+            http2=True,
+            timeout=FEED_TIMEOUT_SECONDS,
+            follow_redirects=True,
+            headers={"User-Agent": FEED_USER_AGENT}
+        )
 
     def fetch_recent_news(self, hours: int = 8, limit: int = 50) -> List[Dict]:
         """
@@ -94,35 +208,43 @@ class NewsFetcher:
             List of news articles with id, title, link, source, published date
         """
         cutoff_time = datetime.now() - timedelta(hours=hours)
+        # Cache the whole 24h window per feed so a later 304 still yields every
+        # article the stale filter would keep, not just this run's slice
+        cache_cutoff = datetime.now() - timedelta(hours=max(hours, 24))
         all_articles = []
         self._articles_cache = {}  # Clear cache
 
-        for feed_url in self.feeds:
-            try:
+        # Feeds are fetched in parallel (network-bound); entries are processed
+        # here in the main thread as each download completes
+        max_workers = max(1, min(FEED_FETCH_WORKERS, len(self.feeds)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for feed_url in self.feeds:
                 logger.info(f"Fetching from: {feed_url}")
-                feed = feedparser.parse(feed_url)
-
-                for entry in feed.entries:
-                    # Parse published date
-                    published = self._parse_date(entry)
-
-                    # Only include recent articles
-                    if published and published > cutoff_time:
-                        article = {
-                            "title": entry.get("title", "No title"),
-                            "link": entry.get("link", ""),
-                            "source": feed.feed.get("title", feed_url),
-                            "published": published,
-                            "summary": entry.get("summary", "")[:500]  # Limit summary length
-                        }
-                        all_articles.append(article)
-
-            except Exception as e:
-                logger.error(f"Error fetching {feed_url}: {e}")
-                continue
-
-        # Sort by published date (newest first)
-        all_articles.sort(key=lambda x: x["published"], reverse=True)
+                etag, modified = self._get_validators(feed_url)
+                future = executor.submit(self._fetch_feed, feed_url, etag, modified)
+                futures[future] = feed_url
+
+            for future in as_completed(futures):
+                feed_url = futures[future]
+                try:
+                    feed = future.result()
+
+                    if feed.get("status") == 304:
+                        # Unchanged since last fetch - reuse the articles extracted then
+                        feed_articles = self._get_cached_articles(feed_url)
+                        if feed_articles is None:
+                            logger.warning(f"Not modified but no cached articles, skipping: {feed_url}")
+                            continue
+                    else:
+                        feed_articles = self._extract_articles(feed, feed_url, cache_cutoff)
+                        self._save_feed_cache(feed_url, feed, feed_articles)
+
+                    all_articles.extend(a for a in feed_articles if a["published"] > cutoff_time)
+
+                except Exception as e:
+                    logger.error(f"Error fetching {feed_url}: {e}")
+                    continue
 
         # ============================================================
         # CRITICAL: Apply strict 24-hour filter AFTER initial fetch
@@ -131,8 +253,8 @@ class NewsFetcher:
         # ============================================================
         all_articles = filter_stale_articles(all_articles, max_age_hours=24)
 
-        # Limit and assign IDs
-        all_articles = all_articles[:limit]
+        # Keep the newest `limit` articles (newest first) and assign IDs
+        all_articles = heapq.nlargest(limit, all_articles, key=itemgetter("published"))
         for i, article in enumerate(all_articles):
             article["id"] = i
             self._articles_cache[i] = article
@@ -140,6 +262,109 @@ class NewsFetcher:
         logger.info(f"Fetched {len(all_articles)} recent articles (after 24h filter)")
         return all_articles
 
+    def _fetch_feed(self, feed_url: str, etag: Optional[str], modified: Optional[str]) -> feedparser.FeedParserDict:
+        """
+        Download a feed (conditional GET) and parse it.
+
+        Parses with lxml and only falls back to feedparser for feeds lxml
+        can't handle (malformed XML, RSS 1.0/RDF, etc.).
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if modified:
+            headers["If-Modified-Since"] = modified
+
+        response = self._http.get(feed_url, headers=headers)
+        if response.status_code == 304:
+            return feedparser.FeedParserDict(status=304, feed=feedparser.FeedParserDict(), entries=[])
+        response.raise_for_status()
+
+        try:
+            feed = parse_feed_stream(response.content)
+        except Exception as e:
+            logger.debug(f"lxml parse failed for {feed_url} ({e}), falling back to feedparser")
+            feed = feedparser.parse(response.content)
+
+        feed["status"] = response.status_code
+        feed["etag"] = response.headers.get("ETag")
+        feed["modified"] = response.headers.get("Last-Modified")
+        return feed
+
+    def _extract_articles(self, feed, feed_url: str, cutoff_time: datetime) -> List[Dict]:
+        """
+        Build article dicts for a parsed feed's entries newer than cutoff_time.
+
+        RSS feeds are near-universally newest-first, so we stop after
+        MAX_ENTRIES_PER_FEED entries or once STALE_STREAK_LIMIT consecutive
+        entries fall before the cutoff. If the first entry has no parseable
+        date there is no ordering to rely on, so the whole feed is scanned.
+        """
+        entries = feed.entries
+        first_dated = bool(entries) and self._has_date(entries[0])
+        if first_dated:
+            entries = entries[:MAX_ENTRIES_PER_FEED]
+
+        articles = []
+        stale_streak = 0
+        for entry in entries:
+            # Parse published date
+            published = self._parse_date(entry)
+
+            # Only include recent articles
+            if published and published > cutoff_time:
+                stale_streak = 0
+                article = {
+                    "title": entry.get("title", "No title"),
+                    "link": entry.get("link", ""),
+                    "source": feed.feed.get("title", feed_url),
+                    "published": published,
+                    "summary": entry.get("summary", "")[:500]  # Limit summary length
+                }
+                articles.append(article)
+            elif first_dated:
+                stale_streak += 1
+                if stale_streak >= STALE_STREAK_LIMIT:
+                    break
+
+        return articles
+
+    def _get_validators(self, feed_url: str) -> Tuple[Optional[str], Optional[str]]:
+        """Look up the (etag, modified) validators for a conditional GET."""
+        if feed_url in self._feed_cache:
+            etag, modified, _ = self._feed_cache[feed_url]
+            return etag, modified
+        if self.storage is None:
+            return None, None
+        try:
+            return self.storage.get_feed_validators(feed_url)
+        except Exception as e:
+            logger.warning(f"Could not load feed validators for {feed_url}: {e}")
+            return None, None
+
+    def _get_cached_articles(self, feed_url: str) -> Optional[List[Dict]]:
+        """Articles extracted from the copy of the feed the validators describe."""
+        if feed_url in self._feed_cache:
+            return self._feed_cache[feed_url][2]
+        if self.storage is None:
+            return None
+        try:
+            return self.storage.get_feed_articles(feed_url)
+        except Exception as e:
+            logger.warning(f"Could not load cached articles for {feed_url}: {e}")
+            return None
+
+    def _save_feed_cache(self, feed_url: str, feed, articles: List[Dict]):
+        """Remember the validators and extracted articles for the next run."""
+        etag, modified = feed.get("etag"), feed.get("modified")
+        self._feed_cache[feed_url] = (etag, modified, articles)
+        if self.storage is None or not (etag or modified):
+            return
+        try:
+            self.storage.save_feed_validators(feed_url, etag, modified, articles)
+        except Exception as e:
+            logger.warning(f"Could not save feed validators for {feed_url}: {e}")
+
     def get_all_headlines(self, hours: int = 8, limit: int = 50) -> List[Dict]:
         """
         Get simplified headline list for AI curation.
@@ -172,20 +397,35 @@ class NewsFetcher:
                 logger.warning(f"Article ID {article_id} not found in cache")
         return articles
     
+    def _has_date(self, entry) -> bool:
+        """Whether an RSS entry carries a parseable published/updated date."""
+        return self._entry_date(entry) is not None
+
+    def _entry_date(self, entry) -> Optional[datetime]:
+        """Parse an entry's published/updated date, or None if it has none."""
+        # Raw RFC-822 / ISO-8601 strings parse directly, skipping feedparser's heuristics
+        raw_date = entry.get("published") or entry.get("updated")
+        if raw_date:
+            parsed = _parse_date_str(raw_date)
+            if parsed:
+                return parsed
+
+        # Fall back to feedparser's pre-parsed UTC tuples for unusual formats
+        for field in ("published_parsed", "updated_parsed"):
+            parsed_tuple = entry.get(field)
+            if parsed_tuple:
+                try:
+                    return _to_local_naive(datetime(*parsed_tuple[:6], tzinfo=timezone.utc))
+                except (TypeError, ValueError):
+                    pass
+
+        return None
+
     def _parse_date(self, entry) -> datetime:
         """Parse the published date from an RSS entry."""
-        # Try different date fields
-        if hasattr(entry, "published_parsed") and entry.published_parsed:
-            try:
-                return datetime(*entry.published_parsed[:6])
-            except:
-                pass
-
-        if hasattr(entry, "updated_parsed") and entry.updated_parsed:
-            try:
-                return datetime(*entry.updated_parsed[:6])
-            except:
-                pass
+        published = self._entry_date(entry)
+        if published:
+            return published
 
         # If no date found, use current time
         return datetime.now()
@@ -1,17 +1,18 @@
 """Twitter poster module to publish tweets via Twitter API v2.
 
-NOTE: tweepy.Client does NOT accept proxies argument - cloud deployment ready.
+NOTE: tweepy AsyncClient does NOT accept proxies argument - cloud deployment ready.
 """
 
 import os
 import time
+import asyncio
 import tweepy
+from tweepy.asynchronous import AsyncClient
 import logging
 from typing import List
 
 import config
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -33,7 +34,7 @@ class TwitterPoster:
 
         # Authenticate with Twitter API v2 - NO PROXIES
         try:
-            self.client = tweepy.Client(
+            self.client = AsyncClient(
                 consumer_key=api_key,
                 consumer_secret=api_secret,
                 access_token=access_token,
@@ -41,12 +42,12 @@ class TwitterPoster:
             )
         except TypeError as e:
             logger.error(f"TypeError creating Client: {e}")
-            logger.error(f"Tweepy Client signature: {tweepy.Client.__init__.__code__.co_varnames}")
+            logger.error(f"Tweepy AsyncClient signature: {AsyncClient.__init__.__code__.co_varnames}")
             raise
         
         logger.info("Twitter API client initialized")
     
-    def post_tweet(self, text: str) -> bool:
+    async def post_tweet(self, text: str) -> bool:
         """
         Post a single tweet.
         
@@ -57,14 +58,14 @@ class TwitterPoster:
             True if successful, False otherwise
         """
         try:
-            response = self.client.create_tweet(text=text)
+            response = await self._create_tweet(text=text)
             logger.info(f"Tweet posted successfully: {text[:50]}...")
             return True
         except Exception as e:
             logger.error(f"Error posting tweet: {e}")
             return False
     
-    def post_thread(self, tweets: List[str]) -> bool:
+    async def post_thread(self, tweets: List[str]) -> bool:
         """
         Post a thread of tweets.
 
@@ -102,21 +103,21 @@ class TwitterPoster:
 
                 if previous_tweet_id:
                     # Reply to previous tweet to create a thread
-                    response = self.client.create_tweet(
+                    response = await self._create_tweet(
                         text=tweet_text,
                         in_reply_to_tweet_id=previous_tweet_id
                     )
                 else:
                     # First tweet in thread
-                    response = self.client.create_tweet(text=tweet_text)
+                    response = await self._create_tweet(text=tweet_text)
 
                 previous_tweet_id = response.data["id"]
                 logger.info(f"Tweet {i} posted: {tweet_text[:50]}...")
 
-                # Add delay between tweets to avoid rate limits
+                # Short pause between tweets (yields to other tasks); real 429s back off in _create_tweet
                 if i < len(tweets):
-                    logger.info("Waiting 60 seconds before next tweet...")
-                    time.sleep(60)
+                    logger.info(f"Waiting {config.INTER_TWEET_DELAY_SECONDS} seconds before next tweet...")
+                    await asyncio.sleep(config.INTER_TWEET_DELAY_SECONDS)
 
             except Exception as e:
                 logger.error(f"Error posting tweet {i}: {e}")
@@ -131,6 +132,35 @@ class TwitterPoster:
 
         return all_success
     
+    async def _create_tweet(self, **kwargs):
+        """Create a tweet, backing off and retrying when Twitter returns 429."""
+        backoff = max(config.INTER_TWEET_DELAY_SECONDS, 1)
+        for attempt in range(1, config.TWEET_RETRY_ATTEMPTS + 1):
+            try:
+                return await self.client.create_tweet(**kwargs)
+            except tweepy.TooManyRequests as e:
+                if attempt == config.TWEET_RETRY_ATTEMPTS:
+                    raise
+                wait = self._rate_limit_wait(e, backoff)
+                if wait > config.MAX_INTER_TWEET_DELAY_SECONDS:
+                    # Window resets too far out for a cron run to wait on; fail now
+                    logger.warning(f"Rate limited, window resets in {wait:.0f}s - not retrying")
+                    raise
+                logger.warning(f"Rate limited (attempt {attempt}/{config.TWEET_RETRY_ATTEMPTS}), retrying in {wait:.0f}s")
+                await asyncio.sleep(wait)
+                backoff = min(backoff * 2, config.MAX_INTER_TWEET_DELAY_SECONDS)
+
+    def _rate_limit_wait(self, error: tweepy.TooManyRequests, fallback: float) -> float:
+        """Seconds until the rate-limit window resets (x-rate-limit-reset), else the fallback backoff."""
+        headers = getattr(error.response, "headers", None) or {}
+        reset = headers.get("x-rate-limit-reset")
+        if reset:
+            try:
+                return max(float(reset) - time.time(), 0) + 1
+            except ValueError:
+                pass
+        return fallback
+
     def test_connection(self) -> bool:
         """
         Test if Twitter API credentials are configured.
@@ -2,19 +2,52 @@
 
 import sqlite3
 import hashlib
-from datetime import datetime
-from typing import List, Dict
+import json
+import math
+from array import array
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Tuple
+
+# Bumped when get_news_hash changes; 1 = blake2b-128 (0 was MD5)
+HASH_SCHEMA_VERSION = 1
+
+# Pre-bound so per-article hashing skips the module attribute lookup
+_blake2b = hashlib.blake2b
+
+
+def news_hash(title: str, source: str) -> str:
+    """
+    Generate a unique hash for a news article.
+
+    Non-cryptographic fingerprint only; blake2b-128 is faster than MD5 and in the stdlib.
+    """
+    return _blake2b(f"{title}|{source}".encode(), digest_size=16).hexdigest()
 
 
 class NewsStorage:
     def __init__(self, db_path: str = "news_history.db"):
         self.db_path = db_path
+
+        # One long-lived autocommit connection; WAL lets readers run alongside a writer
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
         self._init_db()
     
+    def close(self):
+        """Close the database connection."""
+        conn = getattr(self, "_conn", None)
+        if conn is not None:
+            conn.close()
+            self._conn = None
+    
+    def __del__(self):
+        self.close()
+    
     def _init_db(self):
         """Initialize the database with required tables."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS posted_news (
@@ -26,38 +59,89 @@ class NewsStorage:
                 tweet_text TEXT NOT NULL
             )
         """)
+
+        # HTTP validators per RSS feed for conditional GETs
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feed_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                modified TEXT,
+                last_fetched TIMESTAMP NOT NULL,
+                articles TEXT
+            )
+        """)
+        # Older databases created feed_cache before it stored the extracted articles
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(feed_cache)")}
+        if "articles" not in columns:
+            cursor.execute("ALTER TABLE feed_cache ADD COLUMN articles TEXT")
+
+        # Semantic cache: embedded headline sets -> generated tweets
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS analyzer_cache (
+                hash TEXT PRIMARY KEY,
+                embedding BLOB NOT NULL,
+                tweet_text TEXT NOT NULL,
+                created_at TIMESTAMP NOT NULL
+            )
+        """)
+
+        # UNIQUE already indexes news_hash; keep an explicit index for the batched IN lookup
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_news_hash ON posted_news(news_hash)")
+
+        self._migrate_hashes()
+    
+    def _migrate_hashes(self):
+        """One-shot re-hash of rows stored with the old MD5 news_hash (schema version 0)."""
+        cursor = self._conn.cursor()
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        if version >= HASH_SCHEMA_VERSION:
+            return
         
-        conn.commit()
-        conn.close()
+        rows = cursor.execute("SELECT id, title, source FROM posted_news").fetchall()
+        cursor.execute("BEGIN")
+        try:
+            cursor.executemany(
+                "UPDATE posted_news SET news_hash = ? WHERE id = ?",
+                [(self.get_news_hash(title, source), row_id) for row_id, title, source in rows]
+            )
+            cursor.execute(f"PRAGMA user_version = {HASH_SCHEMA_VERSION}")
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
     
     def get_news_hash(self, title: str, source: str) -> str:
         """Generate a unique hash for a news article."""
-        content = f"{title}|{source}"
-        return hashlib.md5(content.encode()).hexdigest()
+        return news_hash(title, source)
     
-    def is_already_posted(self, title: str, source: str) -> bool:
-        """Check if a news article has already been posted."""
-        news_hash = self.get_news_hash(title, source)
+    def filter_unposted_hashes(self, hashes: List[str]) -> List[str]:
+        """Return the news hashes that have not been posted yet, using a single query."""
+        if not hashes:
+            return []
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
+        placeholders = ",".join("?" * len(hashes))
         cursor.execute(
-            "SELECT COUNT(*) FROM posted_news WHERE news_hash = ?",
-            (news_hash,)
+            f"SELECT news_hash FROM posted_news WHERE news_hash IN ({placeholders})",
+            hashes
         )
         
-        count = cursor.fetchone()[0]
-        conn.close()
+        posted = {row[0] for row in cursor.fetchall()}
         
-        return count > 0
+        return [h for h in hashes if h not in posted]
+    
+    def filter_unposted(self, articles: List[Dict]) -> List[Dict]:
+        """Return the articles that have not been posted yet, using a single query."""
+        hashes = [news_hash(a["title"], a["source"]) for a in articles]
+        unposted = set(self.filter_unposted_hashes(hashes))
+        return [a for a, h in zip(articles, hashes) if h in unposted]
     
     def mark_as_posted(self, title: str, source: str, tweet_text: str):
         """Mark a news article as posted."""
         news_hash = self.get_news_hash(title, source)
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
         try:
             cursor.execute(
@@ -65,17 +149,122 @@ class NewsStorage:
                    VALUES (?, ?, ?, ?, ?)""",
                 (news_hash, title, source, datetime.now(), tweet_text)
             )
-            conn.commit()
         except sqlite3.IntegrityError:
             # Already posted, ignore
             pass
-        finally:
-            conn.close()
+    
+    def is_tweet_posted(self, tweet_text: str) -> bool:
+        """Check if this exact tweet text has already been posted."""
+        cursor = self._conn.cursor()
+        
+        cursor.execute(
+            "SELECT COUNT(*) FROM posted_news WHERE tweet_text = ?",
+            (tweet_text,)
+        )
+        
+        return cursor.fetchone()[0] > 0
+    
+    def save_analysis(self, cache_text: str, embedding: List[float], tweets: List[str],
+                      max_age_hours: int):
+        """Store generated tweets keyed by the embedding of their headline set, pruning expired rows."""
+        cache_hash = hashlib.blake2b(cache_text.encode(), digest_size=16).hexdigest()
+        cursor = self._conn.cursor()
+        
+        # find_similar_analysis scans every row, so keep the table to the TTL window
+        cursor.execute(
+            "DELETE FROM analyzer_cache WHERE created_at < ?",
+            (datetime.now() - timedelta(hours=max_age_hours),)
+        )
+        
+        cursor.execute(
+            """INSERT OR REPLACE INTO analyzer_cache (hash, embedding, tweet_text, created_at)
+               VALUES (?, ?, ?, ?)""",
+            (cache_hash, array("f", embedding).tobytes(), json.dumps(tweets), datetime.now())
+        )
+    
+    def find_similar_analysis(self, embedding: List[float], min_similarity: float,
+                              max_age_hours: int) -> Optional[List[str]]:
+        """
+        Find cached tweets for the most similar recent headline set.
+
+        Returns:
+            Cached tweets if the best cosine similarity is >= min_similarity, else None
+        """
+        cutoff = datetime.now() - timedelta(hours=max_age_hours)
+        cursor = self._conn.cursor()
+        
+        cursor.execute(
+            "SELECT embedding, tweet_text FROM analyzer_cache WHERE created_at >= ?",
+            (cutoff,)
+        )
+        
+        query_norm = math.sqrt(sum(x * x for x in embedding))
+        if not query_norm:
+            return None
+        
+        best_similarity, best_tweets = 0.0, None
+        for blob, tweet_text in cursor.fetchall():
+            cached = array("f")
+            cached.frombytes(blob)
+            if len(cached) != len(embedding):
+                continue  # Embedding model changed
+            cached_norm = math.sqrt(sum(x * x for x in cached))
+            if not cached_norm:
+                continue
+            similarity = sum(a * b for a, b in zip(embedding, cached)) / (query_norm * cached_norm)
+            if similarity > best_similarity:
+                best_similarity, best_tweets = similarity, tweet_text
+        
+        if best_tweets is None or best_similarity < min_similarity:
+            return None
+        return json.loads(best_tweets)
+    
+    def get_feed_validators(self, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """Get the stored (etag, modified) for a feed URL."""
+        cursor = self._conn.cursor()
+        
+        # Validators without their articles would turn a 304 into an empty feed
+        cursor.execute(
+            "SELECT etag, modified FROM feed_cache WHERE url = ? AND articles IS NOT NULL",
+            (url,)
+        )
+        
+        row = cursor.fetchone()
+        
+        return (row[0], row[1]) if row else (None, None)
+    
+    def get_feed_articles(self, url: str) -> Optional[List[Dict]]:
+        """Get the articles extracted from the feed copy the stored validators describe."""
+        cursor = self._conn.cursor()
+        
+        cursor.execute(
+            "SELECT articles FROM feed_cache WHERE url = ?",
+            (url,)
+        )
+        
+        row = cursor.fetchone()
+        if not row or row[0] is None:
+            return None
+        
+        articles = json.loads(row[0])
+        for article in articles:
+            article["published"] = datetime.fromisoformat(article["published"])
+        return articles
+    
+    def save_feed_validators(self, url: str, etag: Optional[str], modified: Optional[str],
+                             articles: List[Dict]):
+        """Store the ETag/Last-Modified returned for a feed URL with the articles extracted from it."""
+        cursor = self._conn.cursor()
+        
+        cursor.execute(
+            """INSERT OR REPLACE INTO feed_cache (url, etag, modified, last_fetched, articles)
+               VALUES (?, ?, ?, ?, ?)""",
+            (url, etag, modified, datetime.now(), json.dumps(articles, default=datetime.isoformat))
+        )
     
     def get_recent_posts(self, limit: int = 10) -> List[Dict]:
         """Get recent posted news for debugging."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
         cursor.execute(
             """SELECT title, source, posted_at, tweet_text 
@@ -86,7 +275,6 @@ class NewsStorage:
         )
         
         rows = cursor.fetchall()
-        conn.close()
         
         return [
             {
@@ -0,0 +1,55 @@
+"""Tests for analyzer text helpers."""
+
+import unittest
+
+from analyzer import ThinkStripper, strip_think, truncate_graphemes
+
+
+def _stream(chunks):
+    stripper = ThinkStripper()
+    return "".join(stripper.feed(chunk) for chunk in chunks) + stripper.finalize()
+
+
+class ThinkStripperTest(unittest.TestCase):
+    def test_tags_split_across_chunks(self):
+        chunks = ["Hello <th", "ink>secret</th", "ink> world"]
+        self.assertEqual(_stream(chunks), "Hello  world")
+
+    def test_every_split_point_matches_strip_think(self):
+        text = "a<think>x</think>b<think>y\n\nz</think>c"
+        for i in range(len(text) + 1):
+            for j in range(i, len(text) + 1):
+                with self.subTest(i=i, j=j):
+                    self.assertEqual(_stream([text[:i], text[i:j], text[j:]]), strip_think(text))
+
+    def test_unterminated_block_is_dropped(self):
+        self.assertEqual(_stream(["keep <think>never", " closed"]), "keep ")
+        self.assertEqual(strip_think("keep <think>never closed"), "keep ")
+
+    def test_partial_open_tag_at_end_of_stream_is_flushed(self):
+        self.assertEqual(_stream(["answer <th", "i"]), "answer <thi")
+        self.assertEqual(strip_think("answer <thi"), "answer <thi")
+
+
+class TruncateGraphemesTest(unittest.TestCase):
+    def test_short_text_unchanged(self):
+        self.assertEqual(truncate_graphemes("gm", 10), "gm")
+
+    def test_keeps_combining_mark_with_base(self):
+        text = "a" * 9 + "e\u0301x"
+        self.assertEqual(truncate_graphemes(text, 10), "a" * 9)
+
+    def test_keeps_zwj_sequence_whole(self):
+        family = "\U0001f469\u200d\U0001f469\u200d\U0001f467"
+        text = "a" * 8 + family + "b"
+        self.assertEqual(truncate_graphemes(text, 10), "a" * 8)
+        self.assertEqual(truncate_graphemes(text, 13), "a" * 8 + family)
+
+    def test_keeps_flag_pair_whole(self):
+        text = "a" * 9 + "\U0001f1fa\U0001f1f8" + "b"
+        self.assertEqual(truncate_graphemes(text, 10), "a" * 9)
+        self.assertEqual(truncate_graphemes(text, 11), "a" * 9 + "\U0001f1fa\U0001f1f8")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Tests for feed parsing helpers."""
+
+import unittest
+from datetime import datetime, timezone
+
+from news_fetcher import parse_feed_stream, _parse_date_str
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Desk Wire</title>
+<item><title>ETF flows</title><link> https://example.com/etf </link><description>Inflows</description>
+<pubDate>Tue, 13 Oct 2026 08:00:00 +0000</pubDate></item>
+<item><title>No date</title><link>https://example.com/nodate</link></item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Chain Log</title>
+<entry><title>Upgrade</title>
+<link rel="self" href="https://example.com/self"/>
+<link rel="alternate" href="https://example.com/upgrade"/>
+<summary>Fork live</summary><updated>2026-10-13T08:00:00Z</updated></entry>
+<entry><title>Plain link</title><link href="https://example.com/plain"/></entry>
+</feed>"""
+
+
+class ParseFeedStreamTest(unittest.TestCase):
+    def test_rss_items(self):
+        feed = parse_feed_stream(RSS)
+        self.assertEqual(feed.feed.title, "Desk Wire")
+        self.assertEqual([e.title for e in feed.entries], ["ETF flows", "No date"])
+        self.assertEqual(feed.entries[0].link, "https://example.com/etf")
+        self.assertEqual(feed.entries[0].summary, "Inflows")
+
+    def test_atom_entries_use_alternate_link(self):
+        feed = parse_feed_stream(ATOM)
+        self.assertEqual(feed.feed.title, "Chain Log")
+        self.assertEqual(
+            [e.link for e in feed.entries],
+            ["https://example.com/upgrade", "https://example.com/plain"]
+        )
+        self.assertEqual(feed.entries[0].summary, "Fork live")
+
+    def test_missing_fields_fall_back_to_defaults(self):
+        entry = parse_feed_stream(RSS).entries[1]
+        self.assertEqual(entry.get("summary", ""), "")
+        self.assertNotIn("published", entry)
+
+    def test_no_items_raises(self):
+        with self.assertRaises(ValueError):
+            parse_feed_stream(b"<rss><channel><title>Empty</title></channel></rss>")
+
+
+def _local(value: datetime) -> datetime:
+    return value.astimezone().replace(tzinfo=None)
+
+
+class ParseDateStrTest(unittest.TestCase):
+    def test_rfc822_with_offset(self):
+        self.assertEqual(
+            _parse_date_str("Tue, 13 Oct 2026 10:00:00 +0200"),
+            _local(datetime(2026, 10, 13, 8, 0, tzinfo=timezone.utc))
+        )
+
+    def test_iso8601_with_z_suffix(self):
+        self.assertEqual(
+            _parse_date_str(" 2026-10-13T08:00:00Z "),
+            _local(datetime(2026, 10, 13, 8, 0, tzinfo=timezone.utc))
+        )
+
+    def test_naive_dates_are_treated_as_utc(self):
+        self.assertEqual(
+            _parse_date_str("2026-10-13T08:00:00"),
+            _local(datetime(2026, 10, 13, 8, 0, tzinfo=timezone.utc))
+        )
+
+    def test_unparseable_returns_none(self):
+        self.assertIsNone(_parse_date_str("yesterday-ish"))
+        self.assertIsNone(_parse_date_str(""))
+
+
+if __name__ == "__main__":
+    unittest.main()
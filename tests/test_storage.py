@@ -0,0 +1,76 @@
+"""Tests for NewsStorage."""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from storage import HASH_SCHEMA_VERSION, NewsStorage
+
+
+class MigrateHashesTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+
+        # Database as written before the blake2b switch: MD5 hashes, user_version 0
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("""
+            CREATE TABLE posted_news (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                news_hash TEXT UNIQUE NOT NULL,
+                title TEXT NOT NULL,
+                source TEXT NOT NULL,
+                posted_at TIMESTAMP NOT NULL,
+                tweet_text TEXT NOT NULL
+            )
+        """)
+        for title, source in [("ETF approved", "Wire"), ("Fed holds", "Desk")]:
+            md5 = hashlib.md5(f"{title}|{source}".encode()).hexdigest()
+            conn.execute(
+                "INSERT INTO posted_news (news_hash, title, source, posted_at, tweet_text) VALUES (?, ?, ?, ?, ?)",
+                (md5, title, source, "2026-10-01 08:00:00", "tweet")
+            )
+        conn.commit()
+        conn.close()
+
+        self.storage = NewsStorage(self.db_path)
+
+    def tearDown(self):
+        self.storage.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.db_path + suffix):
+                os.remove(self.db_path + suffix)
+
+    def test_rows_are_rehashed(self):
+        conn = sqlite3.connect(self.db_path)
+        hashes = {row[0] for row in conn.execute("SELECT news_hash FROM posted_news")}
+        conn.close()
+        self.assertEqual(hashes, {
+            self.storage.get_news_hash("ETF approved", "Wire"),
+            self.storage.get_news_hash("Fed holds", "Desk"),
+        })
+
+    def test_user_version_is_bumped(self):
+        conn = sqlite3.connect(self.db_path)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        conn.close()
+        self.assertEqual(version, HASH_SCHEMA_VERSION)
+
+    def test_filter_unposted_sees_migrated_rows(self):
+        articles = [
+            {"title": "ETF approved", "source": "Wire"},
+            {"title": "Fed holds", "source": "Desk"},
+            {"title": "New listing", "source": "Wire"},
+        ]
+        self.assertEqual(self.storage.filter_unposted(articles), [articles[2]])
+
+    def test_migration_runs_once(self):
+        self.storage.close()
+        self.storage = NewsStorage(self.db_path)
+        self.assertEqual(self.storage.filter_unposted([{"title": "Fed holds", "source": "Desk"}]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()